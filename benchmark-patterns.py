@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+CiviAI Enhanced - Field Pattern Worst-Case Benchmark
+Runs every field pattern against adversarial and fuzzed input and fails
+if matching time grows faster than linearly or exceeds the time budget
+"""
+
+import os
+import random
+import string
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'src', 'server'))
+
+from enhanced_document_analyzer import EnhancedDocumentAnalyzer, PATTERN_TIMEOUT_SECONDS
+
+SIZES = [25_000, 100_000, 400_000]
+MAX_SECONDS_PER_SEARCH = 0.5
+# Allowed growth of search time when input grows 4x (linear is 4x, quadratic is 16x)
+MAX_GROWTH_PER_STEP = 8.0
+# Searches faster than this are too noisy to compare for growth
+NOISE_FLOOR_SECONDS = 0.005
+FUZZ_ROUNDS = 200
+FUZZ_LENGTH = 20_000
+
+def adversarial_inputs(size: int) -> dict:
+    """Inputs that trigger backtracking in naive field patterns"""
+    return {
+        'letter_run': '1 ' + 'a' * size,
+        'digit_run': '1' * size,
+        'digit_comma_run': '1,' * (size // 2),
+        'dot_run': '1.' * (size // 2),
+        'space_run': '1' + ' ' * size + 'x',
+        'numbered_words': '1 ab ' * (size // 5),
+        'keyword_spaces': 'Address:' + ' ' * size,
+        'name_run': 'Applicant: ' + 'Ab, ' * (size // 4),
+        'repeated_labels': 'Lot Size: 1 Height: 2 Zone: ' * (size // 28),
+    }
+
+def fuzz_input(rng: random.Random, length: int) -> str:
+    """OCR-garbled text with field labels sprinkled in"""
+    alphabet = string.ascii_letters + string.digits + ' \t\n.,-:#\''
+    labels = ['Address:', 'APN:', 'Lot Size:', 'Zoning:', 'Applicant:', 'Use:', 'Height:', ' Street', ' acres', ' ft']
+    chunks = []
+    while sum(len(chunk) for chunk in chunks) < length:
+        if rng.random() < 0.1:
+            chunks.append(rng.choice(labels))
+        else:
+            run_char = rng.choice(alphabet)
+            chunks.append(run_char * rng.randint(1, 400) if rng.random() < 0.2 else
+                          ''.join(rng.choice(alphabet) for _ in range(rng.randint(1, 40))))
+    return ''.join(chunks)[:length]
+
+def time_search(analyzer: EnhancedDocumentAnalyzer, pattern: str, text: str) -> float:
+    start = time.perf_counter()
+    analyzer._search_pattern(pattern, text)
+    return time.perf_counter() - start
+
+def main():
+    # Disable the time budget so the patterns themselves are measured
+    analyzer = EnhancedDocumentAnalyzer(pattern_timeout=None)
+    patterns = [
+        (f"{field}[{idx}]", pattern)
+        for field, field_patterns in analyzer.field_patterns.items()
+        for idx, pattern in enumerate(field_patterns)
+    ]
+    failures = []
+
+    print("🧪 Worst-case input scaling")
+    print("-" * 50)
+    inputs_by_size = {size: adversarial_inputs(size) for size in SIZES}
+    for field, pattern in patterns:
+        for input_name in inputs_by_size[SIZES[0]]:
+            timings = [time_search(analyzer, pattern, inputs_by_size[size][input_name]) for size in SIZES]
+            worst = max(timings)
+            if worst > MAX_SECONDS_PER_SEARCH:
+                failures.append(f"{field} / {input_name}: {worst:.3f}s exceeds {MAX_SECONDS_PER_SEARCH}s")
+            for previous, current in zip(timings, timings[1:]):
+                if current > NOISE_FLOOR_SECONDS and current / max(previous, 1e-9) > MAX_GROWTH_PER_STEP:
+                    failures.append(f"{field} / {input_name}: time grew {current / previous:.1f}x for 4x input")
+            print(f"  {field:<20} {input_name:<18} " + "  ".join(f"{t * 1000:8.2f}ms" for t in timings))
+
+    print(f"\n🎲 Fuzzing {FUZZ_ROUNDS} garbled documents of {FUZZ_LENGTH} characters")
+    print("-" * 50)
+    rng = random.Random(2025)
+    slowest = 0.0
+    for _ in range(FUZZ_ROUNDS):
+        text = fuzz_input(rng, FUZZ_LENGTH)
+        for field, pattern in patterns:
+            elapsed = time_search(analyzer, pattern, text)
+            slowest = max(slowest, elapsed)
+            if elapsed > MAX_SECONDS_PER_SEARCH:
+                failures.append(f"{field} / fuzz: {elapsed:.3f}s exceeds {MAX_SECONDS_PER_SEARCH}s")
+    print(f"  Slowest fuzzed search: {slowest * 1000:.2f}ms")
+
+    print("\n⏱️  Full extraction with the default time budget")
+    print("-" * 50)
+    budgeted = EnhancedDocumentAnalyzer()
+    document = '\n'.join(adversarial_inputs(SIZES[-1]).values())
+    start = time.perf_counter()
+    budgeted.extract_information_with_patterns(document)
+    elapsed = time.perf_counter() - start
+    limit = len(patterns) * PATTERN_TIMEOUT_SECONDS
+    print(f"  {len(document):,} characters in {elapsed:.3f}s (budget {limit:.2f}s)")
+    if elapsed > limit:
+        failures.append(f"full extraction took {elapsed:.3f}s, over the {limit:.2f}s budget")
+
+    print()
+    if failures:
+        print("❌ Pattern benchmark failed:")
+        for failure in failures:
+            print(f"  • {failure}")
+        sys.exit(1)
+    print("🎉 All field patterns match in linear time")
+
+if __name__ == "__main__":
+    main()
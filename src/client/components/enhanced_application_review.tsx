@@ -32,6 +32,7 @@ import { useToast } from "@/hooks/use-toast";
 import { useMutation, useQuery, useQueryClient } from "@tanstack/react-query";
 import { apiRequest } from "@/lib/queryClient";
 import MissingInfoDetector from "./missing-info-detector";
+import type { FieldLocation } from "@/shared/schema";
 
 interface ApplicationDetails {
   id: number;
@@ -72,6 +73,11 @@ interface ApplicationDetails {
   }>;
 }
 
+interface FieldLocationsResponse {
+  documentId: number;
+  fieldLocations: Record<string, FieldLocation[]>;
+}
+
 interface ApplicationReviewProps {
   applicationId: number;
   onBack: () => void;
@@ -91,6 +97,13 @@ export default function EnhancedApplicationReview({ applicationId, onBack }: App
     enabled: !!applicationId,
   });
 
+  // Fetch stored snippet windows for extracted fields instead of re-parsing the document
+  const { data: locations } = useQuery<FieldLocationsResponse>({
+    queryKey: [`/api/documents/${applicationId}/field-locations`],
+    queryFn: () => apiRequest("GET", `/api/documents/${applicationId}/field-locations`),
+    enabled: !!applicationId && !!application?.analysis,
+  });
+
   // Submit decision
   const decisionMutation = useMutation({
     mutationFn: (data: { decision: string; notes: string }) => 
@@ -287,14 +300,26 @@ export default function EnhancedApplicationReview({ applicationId, onBack }: App
                           <div>
                             <Label className="text-sm font-medium text-gray-600">Extracted Information</Label>
                             <div className="mt-2 grid grid-cols-2 gap-4">
-                              {Object.entries(application.analysis.keyInformation).map(([key, value]) => (
-                                <div key={key} className="flex justify-between items-center p-2 bg-gray-50 rounded">
-                                  <span className="text-xs font-medium text-gray-600 capitalize">
-                                    {key.replace(/([A-Z])/g, ' $1').replace(/_/g, ' ').trim()}:
-                                  </span>
-                                  <span className="text-xs text-gray-900">{String(value)}</span>
-                                </div>
-                              ))}
+                              {Object.entries(application.analysis.keyInformation).map(([key, value]) => {
+                                const location = locations?.fieldLocations[key]?.[0];
+                                return (
+                                  <div
+                                    key={key}
+                                    className="flex justify-between items-center p-2 bg-gray-50 rounded"
+                                    title={location?.snippet ?? undefined}
+                                  >
+                                    <span className="text-xs font-medium text-gray-600 capitalize">
+                                      {key.replace(/([A-Z])/g, ' $1').replace(/_/g, ' ').trim()}:
+                                    </span>
+                                    <span className="text-xs text-gray-900">
+                                      {String(value)}
+                                      {location?.page && (
+                                        <span className="ml-2 text-gray-500">p. {location.page}</span>
+                                      )}
+                                    </span>
+                                  </div>
+                                );
+                              })}
                             </div>
                           </div>
                         </div>
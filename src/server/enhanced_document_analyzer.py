@@ -10,10 +10,12 @@ import sys
 import json
 import logging
 import re
-from typing import Dict, List, Any, Optional, Set, Tuple
+import bisect
+from typing import Dict, List, Any, Optional, Set, Tuple, Union
 from pathlib import Path
 import tempfile
 from dataclasses import dataclass, asdict
+from datetime import datetime, timezone
 from enum import Enum
 
 # Core document processing
@@ -48,10 +50,37 @@ except ImportError as e:
     print(f"Warning: NLP packages not available: {e}")
     print("Some advanced features may not work. Install with: pip install nltk scikit-learn spacy")
 
+# Columnar export (Parquet falls back to CSV when pyarrow is missing)
+try:
+    import pyarrow  # noqa: F401
+    PARQUET_AVAILABLE = True
+except ImportError:
+    PARQUET_AVAILABLE = False
+
+# The regex module supports a per-search timeout; fall back to the stdlib engine without one
+try:
+    import regex
+    REGEX_TIMEOUT_SUPPORTED = True
+except ImportError:
+    regex = re
+    REGEX_TIMEOUT_SUPPORTED = False
+
 # Set up logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Compliance score weight per requirement importance level
+IMPORTANCE_WEIGHTS = {'critical': 3, 'important': 2, 'recommended': 1}
+
+# Time budget for a single field pattern search over a document
+PATTERN_TIMEOUT_SECONDS = 0.25
+
+# Characters of context kept on each side of a found value for reviewer snippets
+SNIPPET_RADIUS = 60
+
+# Entity fields keep the location of the first occurrence of at most this many distinct values
+MAX_ENTITY_LOCATIONS = 5
+
 class DocumentType(Enum):
     """Document types for planning and zoning"""
     ZONING_APPLICATION = "zoning_application"
@@ -84,6 +113,22 @@ class MissingRequirement:
     suggested_source: str
     example_value: Optional[str] = None
 
+@dataclass
+class FieldLocation:
+    """Where an extracted value was found in the source document.
+
+    start, end and snippet_start are offsets into the full extracted document text
+    (all PDF pages joined with newlines), not into the stored extracted_text preview.
+    The value itself is snippet[start - snippet_start:end - snippet_start].
+    """
+    source: str  # "pattern", "entity" or "form"
+    label: str  # pattern id such as "parcel_number[1]", entity label, or form field name
+    start: Optional[int] = None  # character span in the full extracted text
+    end: Optional[int] = None
+    page: Optional[int] = None  # 1-based PDF page
+    snippet: Optional[str] = None
+    snippet_start: Optional[int] = None  # offset of snippet within the full extracted text
+
 @dataclass
 class DocumentAnalysisResult:
     """Complete analysis result including missing information"""
@@ -95,6 +140,17 @@ class DocumentAnalysisResult:
     confidence_score: float
     recommendations: List[str]
     next_steps: List[str]
+    analyzed_at: Optional[str] = None
+    field_locations: Optional[Dict[str, List[FieldLocation]]] = None
+
+@dataclass
+class BulkScoringResult:
+    """Compliance scoring output for many documents at once"""
+    field_names: List[str]
+    presence: np.ndarray  # documents x fields, True where the field has a value
+    missing: np.ndarray  # documents x fields, True where a required field is absent
+    compliance_scores: np.ndarray
+    missing_requirements: Optional[List[List[MissingRequirement]]] = None
 
 class PlanningDocumentRequirements:
     """Defines required information for different document types"""
@@ -155,52 +211,152 @@ class PlanningDocumentRequirements:
         
         return base_requirements
 
+class RequirementMatrix:
+    """Requirements for every document type laid out over a shared field axis"""
+
+    def __init__(self, requirements_provider=None, importance_weights: Optional[Dict[str, float]] = None):
+        requirements_provider = requirements_provider or PlanningDocumentRequirements.get_requirements
+        importance_weights = importance_weights if importance_weights is not None else IMPORTANCE_WEIGHTS
+
+        self.doc_types = list(DocumentType)
+        self.type_index = {doc_type: idx for idx, doc_type in enumerate(self.doc_types)}
+        self.field_names: List[str] = []
+        field_index: Dict[str, int] = {}
+
+        # Per type, (column, category, field_info) in the order the per-document path reports them
+        self.type_entries: List[List[Tuple[int, RequirementCategory, Dict[str, Any]]]] = []
+        for doc_type in self.doc_types:
+            entries = []
+            for category, fields in requirements_provider(doc_type).items():
+                for field_info in fields:
+                    name = field_info['field']
+                    if name not in field_index:
+                        field_index[name] = len(self.field_names)
+                        self.field_names.append(name)
+                    entries.append((field_index[name], category, field_info))
+            self.type_entries.append(entries)
+
+        self.required = np.zeros((len(self.doc_types), len(self.field_names)), dtype=bool)
+        self.weights = np.zeros((len(self.doc_types), len(self.field_names)), dtype=np.float64)
+        for type_idx, entries in enumerate(self.type_entries):
+            for col, _, field_info in entries:
+                self.required[type_idx, col] = True
+                self.weights[type_idx, col] += importance_weights.get(field_info['importance'], 1)
+
+    def presence(self, found_infos: List[Dict[str, Any]]) -> np.ndarray:
+        """Boolean documents x fields matrix of which fields have a truthy value"""
+        flat = np.fromiter(
+            (bool(info.get(name)) for info in found_infos for name in self.field_names),
+            dtype=bool,
+            count=len(found_infos) * len(self.field_names)
+        )
+        return flat.reshape(len(found_infos), len(self.field_names))
+
+    def type_indices(self, doc_types: List[DocumentType]) -> np.ndarray:
+        return np.fromiter((self.type_index[doc_type] for doc_type in doc_types), dtype=np.intp, count=len(doc_types))
+
+    def score(self, type_idx: np.ndarray, presence: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Missing matrix and compliance scores, matching calculate_compliance_score"""
+        missing = self.required[type_idx] & ~presence
+        total_weight = self.weights.sum(axis=1)[type_idx]
+
+        missing_weight = np.zeros(len(type_idx), dtype=np.float64)
+        for t in np.unique(type_idx):
+            rows = type_idx == t
+            missing_weight[rows] = missing[rows] @ self.weights[t]
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            scores = ((total_weight - missing_weight) / total_weight) * 100
+        scores = np.where(total_weight == 0, 100.0, np.clip(scores, 0.0, 100.0))
+        return missing, scores
+
 class EnhancedDocumentAnalyzer:
     """Enhanced document analyzer that identifies missing information"""
     
-    def __init__(self):
+    def __init__(self, form_field_map: Optional[Dict[str, str]] = None,
+                 pattern_timeout: Optional[float] = PATTERN_TIMEOUT_SECONDS):
         self.nlp = None
+        self.pattern_timeout = pattern_timeout
         self.tfidf_vectorizer = TfidfVectorizer(stop_words='english', max_features=1000)
         self._load_nlp_model()
         
-        # Pattern matching for common fields
+        # Pattern matching for common fields. Every repetition is bounded, adjacent
+        # repetitions never overlap and unanchored numbers only start at a number
+        # boundary, so matching stays linear in the document length even on long
+        # runs of letters, digits or whitespace from OCR output.
         self.field_patterns = {
             'property_address': [
-                r'\b\d+\s+[A-Za-z\s]+(?:Street|St|Avenue|Ave|Road|Rd|Drive|Dr|Lane|Ln|Boulevard|Blvd|Way|Circle|Cir|Court|Ct)\b',
-                r'(?:Property|Site|Location)(?:\s+Address)?:\s*([^\n]+)',
-                r'Address:\s*([^\n]+)'
+                r'\b\d{1,6}\s[A-Za-z\s]{1,60}(?:Street|St|Avenue|Ave|Road|Rd|Drive|Dr|Lane|Ln|Boulevard|Blvd|Way|Circle|Cir|Court|Ct)\b',
+                r'(?:Property|Site|Location)(?:\s{1,5}Address)?:\s{0,20}([^\n]{1,200})',
+                r'Address:\s{0,20}([^\n]{1,200})'
             ],
             'parcel_number': [
-                r'(?:Parcel|Tax|Assessor)(?:\s+(?:Number|ID|#))?:\s*([A-Z0-9\-]+)',
-                r'APN:\s*([A-Z0-9\-]+)',
+                r'(?:Parcel|Tax|Assessor)(?:\s{1,5}(?:Number|ID|#))?:\s{0,20}([A-Z0-9\-]{1,30})',
+                r'APN:\s{0,20}([A-Z0-9\-]{1,30})',
                 r'\b\d{2,3}-\d{2,3}-\d{2,3}\b'
             ],
             'lot_size': [
-                r'(?:Lot|Site)\s+Size:\s*([\d,]+\.?\d*)\s*(?:sq\.?\s*ft\.?|square\s+feet|acres?)',
-                r'([\d,]+\.?\d*)\s*(?:sq\.?\s*ft\.?|square\s+feet|acres?)',
-                r'Area:\s*([\d,]+\.?\d*)\s*(?:sq\.?\s*ft\.?|square\s+feet|acres?)'
+                r'(?:Lot|Site)\s{1,5}Size:\s{0,20}(\d[\d,]{0,15}(?:\.\d{1,6})?)\s{0,5}(?:sq\.?\s{0,3}ft\.?|square\s{1,5}feet|acres?)',
+                r'(?<![\d,])(\d[\d,]{0,15}(?:\.\d{1,6})?)\s{0,5}(?:sq\.?\s{0,3}ft\.?|square\s{1,5}feet|acres?)',
+                r'Area:\s{0,20}(\d[\d,]{0,15}(?:\.\d{1,6})?)\s{0,5}(?:sq\.?\s{0,3}ft\.?|square\s{1,5}feet|acres?)'
             ],
             'current_zoning': [
-                r'(?:Current\s+)?Zoning:\s*([A-Z0-9\-]+)',
-                r'Zone:\s*([A-Z0-9\-]+)',
-                r'Zoned\s+([A-Z0-9\-]+)'
+                r'(?:Current\s{1,5})?Zoning:\s{0,20}([A-Z0-9\-]{1,20})',
+                r'Zone:\s{0,20}([A-Z0-9\-]{1,20})',
+                r'Zoned\s{1,5}([A-Z0-9\-]{1,20})'
             ],
             'applicant_name': [
-                r'Applicant:\s*([A-Za-z\s,\.]+)',
-                r'Name:\s*([A-Za-z\s,\.]+)',
-                r'Applied\s+by:\s*([A-Za-z\s,\.]+)'
+                r'Applicant:\s{0,20}([A-Za-z][A-Za-z \t,\.]{0,80})',
+                r'Name:\s{0,20}([A-Za-z][A-Za-z \t,\.]{0,80})',
+                r'Applied\s{1,5}by:\s{0,20}([A-Za-z][A-Za-z \t,\.]{0,80})'
             ],
             'proposed_use': [
-                r'Proposed\s+Use:\s*([^\n]+)',
-                r'Project\s+Description:\s*([^\n]+)',
-                r'Use:\s*([^\n]+)'
+                r'Proposed\s{1,5}Use:\s{0,20}([^\n]{1,200})',
+                r'Project\s{1,5}Description:\s{0,20}([^\n]{1,200})',
+                r'Use:\s{0,20}([^\n]{1,200})'
             ],
             'building_height': [
-                r'(?:Building\s+)?Height:\s*([\d\.]+)\s*(?:feet|ft\.?|\')',
-                r'([\d\.]+)\s*(?:feet|ft\.?|\')\s*(?:high|height)',
-                r'Maximum\s+Height:\s*([\d\.]+)\s*(?:feet|ft\.?|\')'
+                r'(?:Building\s{1,5})?Height:\s{0,20}([\d\.]{1,10})\s{0,5}(?:feet|ft\.?|\')',
+                r'(?<![\d\.])([\d\.]{1,10})\s{0,5}(?:feet|ft\.?|\')\s{0,5}(?:high|height)',
+                r'Maximum\s{1,5}Height:\s{0,20}([\d\.]{1,10})\s{0,5}(?:feet|ft\.?|\')'
             ]
         }
+
+        # Fillable PDF form field names (normalized) mapped onto requirement fields.
+        # Every requirement field name is also accepted as its own form field name.
+        self.form_field_map = {
+            self._normalize_form_field_name(name): name for name in RequirementMatrix().field_names
+        }
+        self.form_field_map.update({
+            'siteaddress': 'property_address',
+            'propertylocation': 'property_address',
+            'apn': 'parcel_number',
+            'parcelid': 'parcel_number',
+            'taxlot': 'parcel_number',
+            'maptaxlot': 'parcel_number',
+            'assessorparcelnumber': 'parcel_number',
+            'lotarea': 'lot_size',
+            'parcelsize': 'lot_size',
+            'acreage': 'lot_size',
+            'zoning': 'current_zoning',
+            'zone': 'current_zoning',
+            'existingzoning': 'current_zoning',
+            'zoningdesignation': 'current_zoning',
+            'owner': 'property_owner',
+            'ownername': 'property_owner',
+            'applicant': 'applicant_name',
+            'applicantmailingaddress': 'applicant_address',
+            'phone': 'applicant_phone',
+            'email': 'applicant_email',
+            'agent': 'agent_info',
+            'projectdescription': 'proposed_use',
+            'height': 'building_height',
+            'maximumheight': 'building_height',
+        })
+        if form_field_map:
+            self.form_field_map.update({
+                self._normalize_form_field_name(name): field for name, field in form_field_map.items()
+            })
     
     def _load_nlp_model(self):
         """Load spaCy model if available"""
@@ -212,17 +368,85 @@ class EnhancedDocumentAnalyzer:
     
     def extract_text_from_pdf(self, file_path: str) -> str:
         """Extract text from PDF file"""
+        return "".join(page + "\n" for page in self.extract_pages_from_pdf(file_path))
+    
+    @staticmethod
+    def _pdf_reader(pdf: Union[str, 'PyPDF2.PdfReader']) -> 'PyPDF2.PdfReader':
+        """Accept a file path or an already parsed reader so one parse can serve every PDF helper"""
+        return pdf if isinstance(pdf, PyPDF2.PdfReader) else PyPDF2.PdfReader(pdf)
+    
+    def extract_pages_from_pdf(self, pdf: Union[str, 'PyPDF2.PdfReader'], max_pages: Optional[int] = None) -> List[str]:
+        """Extract text from each page of a PDF, optionally only the first max_pages"""
         try:
-            with open(file_path, 'rb') as file:
-                pdf_reader = PyPDF2.PdfReader(file)
-                text = ""
-                for page in pdf_reader.pages:
-                    text += page.extract_text() + "\n"
-                return text
+            pdf_reader = self._pdf_reader(pdf)
+            return [page.extract_text() for page in pdf_reader.pages[:max_pages]]
         except Exception as e:
             logger.error(f"Error extracting text from PDF: {e}")
-            return ""
+            return []
     
+    def extract_pdf_metadata_text(self, pdf: Union[str, 'PyPDF2.PdfReader']) -> str:
+        """Title and subject from the PDF document information dictionary"""
+        try:
+            metadata = self._pdf_reader(pdf).metadata or {}
+            return "\n".join(str(metadata[key]) for key in ('/Title', '/Subject') if metadata.get(key))
+        except Exception as e:
+            logger.error(f"Error reading PDF metadata: {e}")
+            return ""
+
+    @staticmethod
+    def _normalize_form_field_name(name: str) -> str:
+        """Reduce a form field name like 'form1[0].Parcel_Number[0]' to 'parcelnumber'"""
+        short_name = re.sub(r'\[\d+\]', '', str(name)).split('.')[-1]
+        return re.sub(r'[^a-z0-9]', '', short_name.lower())
+
+    def extract_form_fields(self, pdf: Union[str, 'PyPDF2.PdfReader']) -> Dict[str, str]:
+        """Extract filled-in AcroForm field values from a fillable PDF"""
+        try:
+            fields = self._pdf_reader(pdf).get_fields() or {}
+        except Exception as e:
+            logger.error(f"Error reading PDF form fields: {e}")
+            return {}
+
+        values = {}
+        for name, field in fields.items():
+            value = field.get('/V')
+            if isinstance(value, list):
+                value = ', '.join(str(item) for item in value)
+            value = str(value).strip() if value is not None else ''
+            # Checkbox and radio states are PDF names such as /Yes or /Off
+            if value.startswith('/'):
+                value = '' if value == '/Off' else value[1:]
+            if value:
+                values[name] = value
+        return values
+
+    def extract_form_field_pages(self, pdf: Union[str, 'PyPDF2.PdfReader']) -> Dict[str, int]:
+        """Find the 1-based page each form field widget sits on, keyed by qualified field name"""
+        pages = {}
+        try:
+            for page_number, page in enumerate(self._pdf_reader(pdf).pages, start=1):
+                for annot in page.get('/Annots') or []:
+                    node = annot.get_object()
+                    names = []
+                    while node is not None:
+                        if '/T' in node:
+                            names.insert(0, str(node['/T']))
+                        node = node['/Parent'].get_object() if '/Parent' in node else None
+                    if names:
+                        pages.setdefault('.'.join(names), page_number)
+        except Exception as e:
+            logger.error(f"Error locating PDF form fields: {e}")
+        return pages
+
+    def map_form_fields(self, form_values: Dict[str, str]) -> Dict[str, Any]:
+        """Map raw form field values onto requirement fields using form_field_map"""
+        mapped = {}
+        for name, value in form_values.items():
+            field_name = self.form_field_map.get(self._normalize_form_field_name(name))
+            if field_name and field_name not in mapped:
+                mapped[field_name] = value
+        return mapped
+
     def extract_text_from_docx(self, file_path: str) -> str:
         """Extract text from DOCX file"""
         try:
@@ -260,21 +484,45 @@ class EnhancedDocumentAnalyzer:
             return max(scores, key=scores.get)
         return DocumentType.UNKNOWN
     
-    def extract_information_with_patterns(self, text: str) -> Dict[str, Any]:
-        """Extract information using regex patterns"""
+    def extract_information_with_patterns(self, text: str, skip_fields: Optional[Set[str]] = None,
+                                          locations: Optional[Dict[str, List[FieldLocation]]] = None) -> Dict[str, Any]:
+        """Extract information using regex patterns, recording match spans into locations if given"""
         extracted = {}
         
         for field_name, patterns in self.field_patterns.items():
-            for pattern in patterns:
-                match = re.search(pattern, text, re.IGNORECASE)
+            if skip_fields and field_name in skip_fields:
+                continue
+            for idx, pattern in enumerate(patterns):
+                match = self._search_pattern(pattern, text)
                 if match:
-                    extracted[field_name] = match.group(1).strip() if match.groups() else match.group(0).strip()
+                    group = 1 if match.groups() else 0
+                    raw_value = match.group(group)
+                    extracted[field_name] = raw_value.strip()
+                    if locations is not None:
+                        start = match.start(group) + len(raw_value) - len(raw_value.lstrip())
+                        locations[field_name] = [FieldLocation(
+                            source='pattern',
+                            label=f"{field_name}[{idx}]",
+                            start=start,
+                            end=start + len(extracted[field_name])
+                        )]
                     break
         
         return extracted
     
-    def extract_information_with_nlp(self, text: str) -> Dict[str, Any]:
-        """Extract information using NLP techniques"""
+    def _search_pattern(self, pattern: str, text: str):
+        """Search for a field pattern within the per-pattern time budget"""
+        try:
+            if REGEX_TIMEOUT_SUPPORTED:
+                return regex.search(pattern, text, regex.IGNORECASE, timeout=self.pattern_timeout)
+            return re.search(pattern, text, re.IGNORECASE)
+        except TimeoutError:
+            logger.warning(f"Pattern search exceeded {self.pattern_timeout}s budget, skipping: {pattern[:60]}")
+            return None
+    
+    def extract_information_with_nlp(self, text: str,
+                                     locations: Optional[Dict[str, List[FieldLocation]]] = None) -> Dict[str, Any]:
+        """Extract information using NLP techniques, recording entity spans into locations if given"""
         if not self.nlp:
             return {}
         
@@ -283,10 +531,16 @@ class EnhancedDocumentAnalyzer:
         
         # Extract named entities
         entities = {}
+        entity_spans = {}
         for ent in doc.ents:
             if ent.label_ not in entities:
                 entities[ent.label_] = []
+                entity_spans[ent.label_] = []
             entities[ent.label_].append(ent.text)
+            # Repeated mentions would only store the same snippet again
+            spans = entity_spans[ent.label_]
+            if len(spans) < MAX_ENTITY_LOCATIONS and ent.text not in {text[span.start:span.end] for span in spans}:
+                spans.append(FieldLocation(source='entity', label=ent.label_, start=ent.start_char, end=ent.end_char))
         
         # Map entities to our fields
         if 'GPE' in entities:  # Geopolitical entities (cities, states)
@@ -301,8 +555,27 @@ class EnhancedDocumentAnalyzer:
         if 'MONEY' in entities:
             extracted['financial_entities'] = entities['MONEY']
         
+        if locations is not None:
+            entity_fields = {'GPE': 'location_entities', 'PERSON': 'person_entities',
+                             'ORG': 'organization_entities', 'MONEY': 'financial_entities'}
+            for label, field_name in entity_fields.items():
+                if label in entity_spans:
+                    locations[field_name] = entity_spans[label]
+        
         return extracted
     
+    def _add_location_context(self, locations: Dict[str, List[FieldLocation]], text: str,
+                              page_offsets: Optional[List[int]] = None):
+        """Fill in page numbers and snippet windows for locations with a character span"""
+        for field_locations in locations.values():
+            for location in field_locations:
+                if location.start is None:
+                    continue
+                if page_offsets:
+                    location.page = bisect.bisect_right(page_offsets, location.start)
+                location.snippet_start = max(0, location.start - SNIPPET_RADIUS)
+                location.snippet = text[location.snippet_start:location.end + SNIPPET_RADIUS]
+    
     def identify_missing_requirements(self, doc_type: DocumentType, found_info: Dict[str, Any]) -> List[MissingRequirement]:
         """Identify missing required information"""
         requirements = PlanningDocumentRequirements.get_requirements(doc_type)
@@ -375,13 +648,12 @@ class EnhancedDocumentAnalyzer:
             return 100.0
         
         # Weight by importance
-        importance_weights = {'critical': 3, 'important': 2, 'recommended': 1}
         total_weight = 0
         missing_weight = 0
         
         for category, fields in requirements.items():
             for field_info in fields:
-                weight = importance_weights.get(field_info['importance'], 1)
+                weight = IMPORTANCE_WEIGHTS.get(field_info['importance'], 1)
                 total_weight += weight
                 
                 if field_info['field'] not in found_info or not found_info[field_info['field']]:
@@ -393,6 +665,42 @@ class EnhancedDocumentAnalyzer:
         compliance_score = ((total_weight - missing_weight) / total_weight) * 100
         return max(0.0, min(100.0, compliance_score))
     
+    def score_documents_bulk(self, doc_types: List[DocumentType], found_infos: List[Dict[str, Any]],
+                             matrix: Optional[RequirementMatrix] = None,
+                             include_requirements: bool = True) -> BulkScoringResult:
+        """Score many documents in one pass; pass a custom RequirementMatrix for what-if rescoring"""
+        matrix = matrix or RequirementMatrix()
+        type_idx = matrix.type_indices(doc_types)
+        presence = matrix.presence(found_infos)
+        missing, scores = matrix.score(type_idx, presence)
+
+        missing_requirements = None
+        if include_requirements:
+            sources = {name: self._get_suggested_source(name) for name in matrix.field_names}
+            examples = {name: self._get_example_value(name) for name in matrix.field_names}
+            missing_requirements = []
+            for row, t in enumerate(type_idx):
+                missing_requirements.append([
+                    MissingRequirement(
+                        category=category,
+                        field_name=field_info['field'],
+                        description=field_info['description'],
+                        importance=field_info['importance'],
+                        suggested_source=sources[field_info['field']],
+                        example_value=examples[field_info['field']]
+                    )
+                    for col, category, field_info in matrix.type_entries[t]
+                    if missing[row, col]
+                ])
+
+        return BulkScoringResult(
+            field_names=matrix.field_names,
+            presence=presence,
+            missing=missing,
+            compliance_scores=scores,
+            missing_requirements=missing_requirements
+        )
+
     def generate_recommendations(self, missing_reqs: List[MissingRequirement]) -> List[str]:
         """Generate recommendations based on missing requirements"""
         recommendations = []
@@ -445,15 +753,52 @@ class EnhancedDocumentAnalyzer:
         
         # Extract text based on file type
         file_ext = Path(file_path).suffix.lower()
+        form_info = {}
+        form_only = False
+        page_offsets = None
+        classification_text = None
+        preview_text = None
+        locations: Dict[str, List[FieldLocation]] = {}
         if file_ext == '.pdf':
-            text = self.extract_text_from_pdf(file_path)
+            # Parse once; every PDF helper below reuses this reader
+            try:
+                pdf_reader = PyPDF2.PdfReader(file_path)
+            except Exception as e:
+                logger.error(f"Error reading PDF: {e}")
+                pdf_reader = None
+            # Fillable forms carry field/value pairs directly; read those before scraping text
+            form_values = self.extract_form_fields(pdf_reader) if pdf_reader else {}
+            form_info = self.map_form_fields(form_values)
+            if form_info:
+                form_pages = self.extract_form_field_pages(pdf_reader)
+                for name, value in form_values.items():
+                    field_name = self.form_field_map.get(self._normalize_form_field_name(name))
+                    if form_info.get(field_name) == value and field_name not in locations:
+                        locations[field_name] = [FieldLocation(
+                            source='form', label=name, page=form_pages.get(name), snippet=f"{name}: {value}"
+                        )]
+            form_only = bool(form_info) and all(name in form_info for name in self.field_patterns)
+            if form_only:
+                # Only the first page is read; classify from it, the metadata and the form
+                # values, never the field names (which contain keywords such as "zoning")
+                pages = self.extract_pages_from_pdf(pdf_reader, max_pages=1)
+                page_offsets = self._page_offsets(pages)
+                text = "".join(page + "\n" for page in pages)
+                classification_text = "\n".join(
+                    [self.extract_pdf_metadata_text(pdf_reader), text, *form_values.values()]
+                )
+                preview_text = "\n".join(f"{name}: {value}" for name, value in form_values.items())
+            else:
+                pages = self.extract_pages_from_pdf(pdf_reader) if pdf_reader else []
+                page_offsets = self._page_offsets(pages)
+                text = "".join(page + "\n" for page in pages)
         elif file_ext in ['.docx', '.doc']:
             text = self.extract_text_from_docx(file_path)
         else:
             with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
                 text = f.read()
         
-        if not text.strip():
+        if not text.strip() and not form_info:
             logger.warning("No text extracted from document")
             return DocumentAnalysisResult(
                 document_type=DocumentType.UNKNOWN,
@@ -463,19 +808,28 @@ class EnhancedDocumentAnalyzer:
                 compliance_score=0.0,
                 confidence_score=0.0,
                 recommendations=["Unable to extract text from document"],
-                next_steps=["Verify document format and try again"]
+                next_steps=["Verify document format and try again"],
+                analyzed_at=datetime.now(timezone.utc).isoformat()
             )
         
         # Classify document type
-        doc_type = self.classify_document_type(text)
+        doc_type = self.classify_document_type(classification_text or text)
+        if form_only and doc_type == DocumentType.UNKNOWN:
+            # Form values and the first page did not identify the document; read every page
+            pages = self.extract_pages_from_pdf(pdf_reader)
+            if pages:
+                page_offsets = self._page_offsets(pages)
+                text = "".join(page + "\n" for page in pages)
+            doc_type = self.classify_document_type(text)
         logger.info(f"Classified as: {doc_type}")
         
-        # Extract information using multiple methods
-        pattern_info = self.extract_information_with_patterns(text)
-        nlp_info = self.extract_information_with_nlp(text)
+        # Extract information using multiple methods, skipping fields the form already filled
+        pattern_info = self.extract_information_with_patterns(text, skip_fields=set(form_info), locations=locations)
+        nlp_info = self.extract_information_with_nlp(text, locations=locations)
+        self._add_location_context(locations, text, page_offsets)
         
         # Combine extracted information
-        found_info = {**pattern_info, **nlp_info}
+        found_info = {**form_info, **pattern_info, **nlp_info}
         
         # Identify missing requirements
         missing_reqs = self.identify_missing_requirements(doc_type, found_info)
@@ -486,25 +840,225 @@ class EnhancedDocumentAnalyzer:
         
         # Generate recommendations and next steps
         recommendations = self.generate_recommendations(missing_reqs)
+        preview_text = preview_text or text
         next_steps = self.generate_next_steps(doc_type, missing_reqs)
         
         return DocumentAnalysisResult(
             document_type=doc_type,
-            extracted_text=text[:1000] + "..." if len(text) > 1000 else text,
+            extracted_text=preview_text[:1000] + "..." if len(preview_text) > 1000 else preview_text,
             found_information=found_info,
             missing_requirements=missing_reqs,
             compliance_score=compliance_score,
             confidence_score=confidence_score,
             recommendations=recommendations,
-            next_steps=next_steps
+            next_steps=next_steps,
+            analyzed_at=datetime.now(timezone.utc).isoformat(),
+            field_locations=locations
+        )
+    
+    @staticmethod
+    def _page_offsets(pages: List[str]) -> List[int]:
+        """Start offset of each page within the joined document text"""
+        offsets = []
+        position = 0
+        for page in pages:
+            offsets.append(position)
+            position += len(page) + 1
+        return offsets
+
+class AnalysisCorpus:
+    """Columnar table of analysis results for batch reporting"""
+
+    MISSING_PREFIX = 'missing__'
+
+    # complianceIssues severities stored by the server map back to importance levels
+    SEVERITY_IMPORTANCE = {'error': 'critical', 'warning': 'important', 'info': 'recommended'}
+
+    def __init__(self, frame: pd.DataFrame):
+        self.frame = frame
+
+    @staticmethod
+    def requirement_fields() -> List[str]:
+        """All requirement field names across document types, in declaration order"""
+        return list(RequirementMatrix().field_names)
+
+    @property
+    def missing_columns(self) -> List[str]:
+        return [col for col in self.frame.columns if col.startswith(self.MISSING_PREFIX)]
+
+    @classmethod
+    def from_results(cls, results: List[DocumentAnalysisResult], document_ids: Optional[List[Any]] = None) -> 'AnalysisCorpus':
+        """Build a corpus from in-memory analysis results"""
+        rows = []
+        for i, result in enumerate(results):
+            rows.append({
+                'document_id': document_ids[i] if document_ids is not None else i,
+                'document_type': result.document_type.value,
+                'analyzed_at': result.analyzed_at,
+                'compliance_score': result.compliance_score,
+                'confidence_score': result.confidence_score,
+                'missing': [(req.field_name, req.importance) for req in result.missing_requirements],
+            })
+        return cls._from_rows(rows)
+
+    @classmethod
+    def from_records(cls, records: List[Dict[str, Any]]) -> 'AnalysisCorpus':
+        """Build a corpus from stored analysis records or analyzer JSON output"""
+        rows = []
+        for i, record in enumerate(records):
+            if 'complianceIssues' in record:
+                missing = [
+                    (issue.get('field_name'), cls.SEVERITY_IMPORTANCE.get(issue.get('severity'), 'recommended'))
+                    for issue in record['complianceIssues'] if issue.get('field_name')
+                ]
+            else:
+                missing = [
+                    (req.get('field_name'), req.get('importance', 'recommended'))
+                    for req in record.get('missing_requirements', []) if req.get('field_name')
+                ]
+            rows.append({
+                'document_id': record.get('documentId', record.get('document_id', record.get('id', i))),
+                'document_type': record.get('classification', record.get('document_type', DocumentType.UNKNOWN.value)),
+                # Records stored before analyzedAt existed can be joined with their document's submissionDate
+                'analyzed_at': record.get('analyzedAt', record.get('analyzed_at', record.get('submissionDate'))),
+                'compliance_score': record.get('complianceScore', record.get('compliance_score')),
+                'confidence_score': record.get('confidenceScore', record.get('confidence_score')),
+                'missing': missing,
+            })
+        return cls._from_rows(rows)
+
+    @classmethod
+    def _from_rows(cls, rows: List[Dict[str, Any]]) -> 'AnalysisCorpus':
+        """Assemble typed columns and the one-hot missing-field matrix"""
+        fields = cls.requirement_fields()
+        field_index = {name: idx for idx, name in enumerate(fields)}
+        for row in rows:
+            for field_name, _ in row['missing']:
+                if field_name not in field_index:
+                    field_index[field_name] = len(fields)
+                    fields.append(field_name)
+
+        # Scatter (row, field) pairs into a boolean matrix in one assignment
+        row_idx = [i for i, row in enumerate(rows) for _ in row['missing']]
+        col_idx = [field_index[name] for row in rows for name, _ in row['missing']]
+        critical = np.array([imp == 'critical' for row in rows for _, imp in row['missing']], dtype=bool)
+        missing = np.zeros((len(rows), len(fields)), dtype=bool)
+        missing[row_idx, col_idx] = True
+        critical_counts = np.bincount(np.asarray(row_idx, dtype=np.int64)[critical], minlength=len(rows))
+
+        frame = pd.DataFrame({
+            'document_id': [row['document_id'] for row in rows],
+            'document_type': pd.Categorical(
+                [row['document_type'] for row in rows],
+                categories=[doc_type.value for doc_type in DocumentType]
+            ),
+            'analyzed_at': pd.to_datetime([row['analyzed_at'] for row in rows], utc=True, errors='coerce'),
+            'compliance_score': pd.to_numeric([row['compliance_score'] for row in rows], errors='coerce').astype(np.float32),
+            'confidence_score': pd.to_numeric([row['confidence_score'] for row in rows], errors='coerce').astype(np.float32),
+            'missing_count': missing.sum(axis=1).astype(np.int32),
+            'critical_missing_count': critical_counts.astype(np.int32),
+        })
+        missing_frame = pd.DataFrame(missing, columns=[cls.MISSING_PREFIX + name for name in fields])
+        return cls(pd.concat([frame, missing_frame], axis=1))
+
+    def export(self, path: str) -> Path:
+        """Write the corpus to Parquet (.parquet) or CSV with 0/1 missing columns, returning the path written"""
+        output = Path(path)
+        if output.suffix == '.parquet':
+            if PARQUET_AVAILABLE:
+                self.frame.to_parquet(output, index=False)
+                return output
+            logger.warning("pyarrow not available, exporting corpus as CSV instead of Parquet")
+            output = output.with_suffix('.csv')
+
+        compact = self.frame.copy()
+        compact[self.missing_columns] = compact[self.missing_columns].astype(np.uint8)
+        compact.to_csv(output, index=False)
+        return output
+
+    @classmethod
+    def load(cls, path: str) -> 'AnalysisCorpus':
+        """Load a corpus previously written by export()"""
+        source = Path(path)
+        if source.suffix == '.parquet':
+            return cls(pd.read_parquet(source))
+
+        frame = pd.read_csv(source)
+        missing_cols = [col for col in frame.columns if col.startswith(cls.MISSING_PREFIX)]
+        frame[missing_cols] = frame[missing_cols].astype(bool)
+        frame['document_type'] = pd.Categorical(
+            frame['document_type'], categories=[doc_type.value for doc_type in DocumentType]
         )
+        frame['analyzed_at'] = pd.to_datetime(frame['analyzed_at'], utc=True, errors='coerce')
+        for col in ('compliance_score', 'confidence_score'):
+            frame[col] = frame[col].astype(np.float32)
+        for col in ('missing_count', 'critical_missing_count'):
+            frame[col] = frame[col].astype(np.int32)
+        return cls(frame)
+
+    def most_missing_fields(self, top_n: int = 10) -> pd.DataFrame:
+        """Most frequently missing fields per document type"""
+        grouped = self.frame.groupby('document_type', observed=True)
+        counts = grouped[self.missing_columns].sum()
+        counts.columns = [col[len(self.MISSING_PREFIX):] for col in counts.columns]
+        rates = counts.div(grouped.size(), axis=0)
+
+        summary = pd.DataFrame({
+            'missing_count': counts.stack(),
+            'missing_rate': rates.stack(),
+        })
+        summary.index.names = ['document_type', 'field_name']
+        summary = summary[summary['missing_count'] > 0].reset_index()
+        summary = summary.sort_values(['document_type', 'missing_count'], ascending=[True, False])
+        return summary.groupby('document_type', observed=True).head(top_n).reset_index(drop=True)
+
+    def compliance_distribution(self, bins: Tuple[float, ...] = (0, 20, 40, 60, 80, 100)) -> pd.DataFrame:
+        """Count of documents per compliance score bucket, by document type"""
+        buckets = pd.cut(self.frame['compliance_score'], bins=list(bins), include_lowest=True)
+        return (
+            self.frame.groupby(['document_type', buckets], observed=True)
+            .size()
+            .unstack(fill_value=0)
+        )
+
+    def compliance_trend(self, freq: str = 'MS') -> pd.DataFrame:
+        """Mean compliance score and missing counts per period and document type"""
+        dated = self.frame.dropna(subset=['analyzed_at'])
+        return (
+            dated.groupby([pd.Grouper(key='analyzed_at', freq=freq), 'document_type'], observed=True)
+            .agg(
+                documents=('compliance_score', 'size'),
+                mean_compliance=('compliance_score', 'mean'),
+                mean_missing=('missing_count', 'mean'),
+                mean_critical_missing=('critical_missing_count', 'mean'),
+            )
+            .reset_index()
+        )
+
+def export_corpus(records_path: str, output_path: str):
+    """Export a JSON array or JSON-lines file of analysis records to a columnar file"""
+    with open(records_path, 'r', encoding='utf-8') as f:
+        content = f.read().strip()
+    if content.startswith('['):
+        records = json.loads(content)
+    else:
+        records = [json.loads(line) for line in content.splitlines() if line.strip()]
+
+    corpus = AnalysisCorpus.from_records(records)
+    written = corpus.export(output_path)
+    print(json.dumps({'documents': len(corpus.frame), 'output': str(written)}, indent=2))
 
 def main():
     """Main function for command-line usage"""
+    if len(sys.argv) == 4 and sys.argv[1] == '--export-corpus':
+        export_corpus(sys.argv[2], sys.argv[3])
+        return
+
     if len(sys.argv) != 2:
         print("Usage: python enhanced_document_analyzer.py <file_path>")
+        print("       python enhanced_document_analyzer.py --export-corpus <records.json> <output.parquet|output.csv>")
         sys.exit(1)
-    
+
     file_path = sys.argv[1]
     if not os.path.exists(file_path):
         print(f"Error: File {file_path} not found")
@@ -517,11 +1071,16 @@ def main():
     output = {
         'document_type': result.document_type.value,
         'found_information': result.found_information,
-        'missing_requirements': [asdict(req) for req in result.missing_requirements],
+        'missing_requirements': [{**asdict(req), 'category': req.category.value} for req in result.missing_requirements],
         'compliance_score': result.compliance_score,
         'confidence_score': result.confidence_score,
         'recommendations': result.recommendations,
         'next_steps': result.next_steps,
+        'analyzed_at': result.analyzed_at,
+        'field_locations': {
+            name: [asdict(location) for location in field_locations]
+            for name, field_locations in (result.field_locations or {}).items()
+        },
         'extracted_text_preview': result.extracted_text
     }
     
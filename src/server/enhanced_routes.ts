@@ -3,7 +3,7 @@ import { createServer, type Server } from "http";
 import { storage } from "./storage";
 import { zoningService } from "./zoning";
 import { spawn } from 'child_process';
-import { insertUserSchema, insertDocumentSchema, insertAnalysisSchema } from "@shared/schema";
+import { insertUserSchema, insertDocumentSchema, insertAnalysisSchema, type FieldLocation } from "@shared/schema";
 import multer from "multer";
 import path from "path";
 import fs from "fs";
@@ -112,6 +112,8 @@ async function processDocumentEnhanced(documentId: number) {
             extractedText: analysisResult.extracted_text_preview,
             keyInformation: analysisResult.found_information,
             complianceScore: analysisResult.compliance_score,
+            confidenceScore: analysisResult.confidence_score,
+            analyzedAt: analysisResult.analyzed_at,
             complianceIssues: analysisResult.missing_requirements.map((req: any) => ({
               severity: req.importance === 'critical' ? 'error' : req.importance === 'important' ? 'warning' : 'info',
               issue: `Missing: ${req.description}`,
@@ -126,7 +128,8 @@ async function processDocumentEnhanced(documentId: number) {
               missingRequirements: analysisResult.missing_requirements,
               recommendations: analysisResult.recommendations,
               nextSteps: analysisResult.next_steps
-            }
+            },
+            fieldLocations: analysisResult.field_locations || {}
           });
 
           await storage.updateDocumentStatus(documentId, 'completed');
@@ -406,7 +409,13 @@ export async function registerRoutes(app: Express): Promise<Server> {
         return res.status(404).json({ message: 'Document not found' });
       }
 
-      const analysis = await storage.getAnalysisByDocumentId(id);
+      const storedAnalysis = await storage.getAnalysisByDocumentId(id);
+      // Field provenance is served separately by /api/documents/:id/field-locations
+      let analysis = storedAnalysis;
+      if (storedAnalysis) {
+        const { fieldLocations, ...rest } = storedAnalysis;
+        analysis = rest;
+      }
       res.json({ ...document, analysis });
     } catch (error) {
       console.error('Get document error:', error);
@@ -414,6 +423,40 @@ export async function registerRoutes(app: Express): Promise<Server> {
     }
   });
 
+  // Field provenance: snippet windows for where each extracted value was found
+  app.get('/api/documents/:id/field-locations', requireAuth, async (req, res) => {
+    try {
+      const id = parseInt(req.params.id);
+      const document = await storage.getDocument(id);
+      
+      if (!document || document.userId !== req.session.userId!) {
+        return res.status(404).json({ message: 'Document not found' });
+      }
+
+      const analysis = await storage.getAnalysisByDocumentId(id);
+      if (!analysis) {
+        return res.status(404).json({ message: 'Analysis not found. Document may still be processing.' });
+      }
+
+      const allLocations = analysis.fieldLocations || {};
+      const requestedFields = typeof req.query.fields === 'string'
+        ? req.query.fields.split(',').map(field => field.trim()).filter(Boolean)
+        : Object.keys(allLocations);
+
+      const fieldLocations: Record<string, FieldLocation[]> = {};
+      for (const field of requestedFields) {
+        if (allLocations[field]) {
+          fieldLocations[field] = allLocations[field];
+        }
+      }
+
+      res.json({ documentId: id, fieldLocations });
+    } catch (error) {
+      console.error('Get field locations error:', error);
+      res.status(500).json({ message: 'Failed to get field locations' });
+    }
+  });
+
   // Zoning routes (keeping existing)
   app.get('/api/zoning/rules', async (req, res) => {
     try {
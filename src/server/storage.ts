@@ -1,6 +1,8 @@
 // Simple in-memory storage for development
 // In production, this would be replaced with a proper database
 
+import type { FieldLocation } from "../shared/schema";
+
 interface User {
   id: number;
   email: string;
@@ -29,6 +31,8 @@ interface Analysis {
   extractedText: string;
   keyInformation: Record<string, any>;
   complianceScore: number;
+  confidenceScore?: number;
+  analyzedAt?: string;
   complianceIssues: Array<{
     severity: string;
     issue: string;
@@ -44,6 +48,7 @@ interface Analysis {
     recommendations: string[];
     nextSteps: string[];
   };
+  fieldLocations?: Record<string, FieldLocation[]>;
 }
 
 class InMemoryStorage {
@@ -112,6 +117,8 @@ class InMemoryStorage {
         lot_size: '0.25 acres'
       },
       complianceScore: 85,
+      confidenceScore: 50,
+      analyzedAt: '2025-01-15T10:35:00Z',
       complianceIssues: [
         {
           severity: 'warning',
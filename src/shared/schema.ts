@@ -28,8 +28,11 @@ export interface Analysis {
   extractedText: string;
   keyInformation: Record<string, any>;
   complianceScore: number;
+  confidenceScore?: number;
+  analyzedAt?: string;
   complianceIssues: ComplianceIssue[];
   zoningInfo: ZoningInfo;
+  fieldLocations?: Record<string, FieldLocation[]>;
 }
 
 export interface ComplianceIssue {
@@ -41,6 +44,16 @@ export interface ComplianceIssue {
   example_value?: string;
 }
 
+export interface FieldLocation {
+  source: 'pattern' | 'entity' | 'form';
+  label: string;
+  start: number | null;
+  end: number | null;
+  page: number | null;
+  snippet: string | null;
+  snippet_start: number | null;
+}
+
 export interface ZoningInfo {
   currentZone: string;
   compliance: string;
@@ -103,8 +116,11 @@ export const insertAnalysisSchema = {
   extractedText: { type: 'string', required: true },
   keyInformation: { type: 'object', required: true },
   complianceScore: { type: 'number', required: true },
+  confidenceScore: { type: 'number', required: false },
+  analyzedAt: { type: 'string', required: false },
   complianceIssues: { type: 'array', required: true },
-  zoningInfo: { type: 'object', required: true }
+  zoningInfo: { type: 'object', required: true },
+  fieldLocations: { type: 'object', required: false }
 };
 
 // API Response types
@@ -1,11 +1,19 @@
 #!/usr/bin/env python3
 """
 CiviAI Enhanced - Python Component Test
-Tests the document analyzer logic without requiring full dependencies
+Tests the document analyzer logic without requiring full dependencies,
+then checks bulk compliance scoring against the full analyzer
+(requires the packages from requirements.txt)
 """
 
+import contextlib
+import io
 import json
+import os
+import random
 import re
+import sys
+import tempfile
 from typing import Dict, List, Any
 from dataclasses import dataclass
 from enum import Enum
@@ -226,5 +234,239 @@ def test_document_analyzer():
     print(f"📋 The analyzer correctly identified document types and missing information.")
     print(f"🚀 Ready for integration with the full CiviAI Enhanced platform!")
 
+def load_full_analyzer():
+    """Import the full analyzer module (requires the packages from requirements.txt)"""
+    server_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'src', 'server')
+    if server_dir not in sys.path:
+        sys.path.insert(0, server_dir)
+    import enhanced_document_analyzer
+    return enhanced_document_analyzer
+
+def reference_score(doc_type, found_info, importance_weights) -> float:
+    """Per-document weighted score, mirroring calculate_compliance_score with custom weights"""
+    from enhanced_document_analyzer import PlanningDocumentRequirements
+
+    total_weight = 0
+    missing_weight = 0
+    for fields in PlanningDocumentRequirements.get_requirements(doc_type).values():
+        for field_info in fields:
+            weight = importance_weights.get(field_info['importance'], 1)
+            total_weight += weight
+            if not found_info.get(field_info['field']):
+                missing_weight += weight
+    if total_weight == 0:
+        return 100.0
+    return max(0.0, min(100.0, ((total_weight - missing_weight) / total_weight) * 100))
+
+def test_bulk_scoring():
+    """Check bulk scoring against the per-document path on random documents"""
+    print("\n🧪 Testing bulk compliance scoring against the per-document path\n")
+
+    analyzer_module = load_full_analyzer()
+    DocumentType = analyzer_module.DocumentType
+    EnhancedDocumentAnalyzer = analyzer_module.EnhancedDocumentAnalyzer
+    RequirementMatrix = analyzer_module.RequirementMatrix
+
+    analyzer = EnhancedDocumentAnalyzer()
+    fields = RequirementMatrix().field_names + ['location_entities', 'unrelated_field']
+    rng = random.Random(42)
+    doc_types = [rng.choice(list(DocumentType)) for _ in range(2000)]
+    found_infos = [
+        {name: rng.choice(['value', '', None, 0, [], ['item']]) for name in fields if rng.random() < 0.6}
+        for _ in doc_types
+    ]
+
+    bulk = analyzer.score_documents_bulk(doc_types, found_infos)
+    mismatches = 0
+    for idx, (doc_type, found_info) in enumerate(zip(doc_types, found_infos)):
+        missing = analyzer.identify_missing_requirements(doc_type, found_info)
+        score = analyzer.calculate_compliance_score(doc_type, found_info, missing)
+        if missing != bulk.missing_requirements[idx] or score != float(bulk.compliance_scores[idx]):
+            mismatches += 1
+    print(f"📊 Default weights: {mismatches}/{len(doc_types)} mismatches")
+
+    what_if_weights = {'critical': 5, 'important': 1, 'recommended': 0}
+    what_if = analyzer.score_documents_bulk(
+        doc_types, found_infos,
+        matrix=RequirementMatrix(importance_weights=what_if_weights),
+        include_requirements=False
+    )
+    what_if_mismatches = sum(
+        1 for idx, (doc_type, found_info) in enumerate(zip(doc_types, found_infos))
+        if reference_score(doc_type, found_info, what_if_weights) != float(what_if.compliance_scores[idx])
+    )
+    print(f"📊 What-if weights: {what_if_mismatches}/{len(doc_types)} mismatches")
+
+    if mismatches or what_if_mismatches:
+        print("❌ Bulk scoring does not match the per-document path")
+        sys.exit(1)
+    print("✅ Bulk scoring matches the per-document path")
+
+def test_field_provenance():
+    """Check that found values carry their span, pattern and snippet through to the CLI JSON"""
+    print("\n🧪 Testing field provenance\n")
+
+    analyzer_module = load_full_analyzer()
+    text = (
+        "ZONING APPLICATION\n"
+        "Applicant: Jane Roe\n"
+        "APN: 37-1W-25-1000\n"
+        "Proposed Use: Detached garage\n"
+    )
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        fixture = os.path.join(tmp_dir, 'application.txt')
+        with open(fixture, 'w', encoding='utf-8') as f:
+            f.write(text)
+
+        result = analyzer_module.EnhancedDocumentAnalyzer().analyze_document(fixture)
+        location = result.field_locations['parcel_number'][0]
+        value = result.found_information['parcel_number']
+        assert value == '37-1W-25-1000', value
+        assert (location.start, location.end) == (text.index(value), text.index(value) + len(value)), location
+        assert location.source == 'pattern' and location.label == 'parcel_number[1]', location
+        assert value in location.snippet, location
+        assert location.snippet[location.start - location.snippet_start:location.end - location.snippet_start] == value
+        print(f"📍 parcel_number found by {location.label} at {location.start}-{location.end}")
+
+        # main() output is what the server stores, so the locations must be in it
+        stdout = io.StringIO()
+        original_argv = sys.argv
+        sys.argv = ['enhanced_document_analyzer.py', fixture]
+        try:
+            with contextlib.redirect_stdout(stdout):
+                analyzer_module.main()
+        finally:
+            sys.argv = original_argv
+        output = json.loads(stdout.getvalue())
+        assert output['field_locations']['parcel_number'][0]['label'] == 'parcel_number[1]', output['field_locations']
+        assert output['field_locations']['applicant_name'][0]['start'] == text.index('Jane Roe')
+
+    print("✅ Field provenance recorded and emitted in CLI output")
+
+def test_form_fields():
+    """Check AcroForm value extraction, name mapping and pattern skipping"""
+    print("\n🧪 Testing fillable PDF form field mapping\n")
+
+    analyzer_module = load_full_analyzer()
+    PyPDF2 = analyzer_module.PyPDF2
+
+    class FakeFormReader(PyPDF2.PdfReader):
+        """Reader stand-in that only answers get_fields()"""
+        def __init__(self, fields):
+            self._fake_fields = fields
+
+        def get_fields(self):
+            return self._fake_fields
+
+    reader = FakeFormReader({
+        'form1[0].Parcel_Number[0]': {'/V': '37-1W-25-1000'},
+        'Existing Zoning': {'/V': 'R-1'},
+        'Agent': {'/V': PyPDF2.generic.NameObject('/Yes')},
+        'Owner Consent': {'/V': PyPDF2.generic.NameObject('/Off')},
+        'Proposed Use': {'/V': ['Garage', 'Workshop']},
+        'Box 7': {'/V': 'Pat Owner'},
+        'Empty Field': {'/V': ''},
+    })
+
+    assert analyzer_module.EnhancedDocumentAnalyzer._normalize_form_field_name('form1[0].Parcel_Number[0]') == 'parcelnumber'
+
+    analyzer = analyzer_module.EnhancedDocumentAnalyzer(form_field_map={'Box 7': 'property_owner'})
+    values = analyzer.extract_form_fields(reader)
+    assert values == {
+        'form1[0].Parcel_Number[0]': '37-1W-25-1000',
+        'Existing Zoning': 'R-1',
+        'Agent': 'Yes',
+        'Proposed Use': 'Garage, Workshop',
+        'Box 7': 'Pat Owner',
+    }, values
+
+    mapped = analyzer.map_form_fields(values)
+    assert mapped == {
+        'parcel_number': '37-1W-25-1000',
+        'current_zoning': 'R-1',
+        'agent_info': 'Yes',
+        'proposed_use': 'Garage, Workshop',
+        'property_owner': 'Pat Owner',
+    }, mapped
+    print(f"📋 Mapped form fields: {sorted(mapped)}")
+
+    # Fields the form filled are not searched for again in the page text
+    text = "APN: 99-99-99\nApplicant: Jane Roe\nZoning: C-2\n"
+    pattern_info = analyzer.extract_information_with_patterns(text, skip_fields=set(mapped))
+    assert 'parcel_number' not in pattern_info and 'current_zoning' not in pattern_info, pattern_info
+    assert pattern_info.get('applicant_name') == 'Jane Roe', pattern_info
+
+    print("✅ Form fields mapped and satisfied fields skipped by patterns")
+
+def test_analysis_corpus():
+    """Check the columnar corpus built from results and stored records, and its CSV round-trip"""
+    print("\n🧪 Testing columnar analysis corpus\n")
+
+    analyzer_module = load_full_analyzer()
+    pd = analyzer_module.pd
+    DocumentType = analyzer_module.DocumentType
+    AnalysisCorpus = analyzer_module.AnalysisCorpus
+    analyzer = analyzer_module.EnhancedDocumentAnalyzer()
+
+    all_fields = analyzer_module.RequirementMatrix().field_names
+    results = []
+    for absent, analyzed_at in ([{'parcel_number', 'landscaping_plan'}, '2025-01-10T09:00:00+00:00'],
+                                [{'parcel_number'}, '2025-02-03T15:30:00+00:00']):
+        found = {name: 'value' for name in all_fields if name not in absent}
+        missing = analyzer.identify_missing_requirements(DocumentType.ZONING_APPLICATION, found)
+        results.append(analyzer_module.DocumentAnalysisResult(
+            document_type=DocumentType.ZONING_APPLICATION,
+            extracted_text='',
+            found_information=found,
+            missing_requirements=missing,
+            compliance_score=analyzer.calculate_compliance_score(DocumentType.ZONING_APPLICATION, found, missing),
+            confidence_score=70.0,
+            recommendations=[],
+            next_steps=[],
+            analyzed_at=analyzed_at
+        ))
+
+    corpus = AnalysisCorpus.from_results(results, document_ids=[101, 102])
+    frame = corpus.frame
+    assert frame['missing__parcel_number'].tolist() == [True, True]
+    assert frame['missing__landscaping_plan'].tolist() == [True, False]
+    assert not frame['missing__property_address'].any()
+    assert frame['missing_count'].tolist() == [2, 1]
+    assert frame['critical_missing_count'].tolist() == [1, 1]
+
+    top = corpus.most_missing_fields(top_n=1)
+    assert top[['document_type', 'field_name', 'missing_count']].values.tolist() == [['zoning_application', 'parcel_number', 2]], top
+    assert top['missing_rate'].tolist() == [1.0]
+    print(f"📊 Most missing: {top['field_name'].tolist()}")
+
+    # Records shaped like storage.createAnalysis
+    records = [{
+        'documentId': 7,
+        'classification': 'building_permit',
+        'complianceScore': 72.5,
+        'confidenceScore': 40,
+        'analyzedAt': '2025-03-01T12:00:00Z',
+        'complianceIssues': [
+            {'severity': 'error', 'field_name': 'water_connection'},
+            {'severity': 'info', 'field_name': 'applicant_email'},
+        ],
+    }]
+    stored = AnalysisCorpus.from_records(records).frame
+    assert stored['missing__water_connection'].tolist() == [True]
+    assert stored['missing__applicant_email'].tolist() == [True]
+    assert stored['missing_count'].tolist() == [2]
+    assert stored['critical_missing_count'].tolist() == [1]
+    assert stored['confidence_score'].notna().all() and stored['analyzed_at'].notna().all()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        written = corpus.export(os.path.join(tmp_dir, 'corpus.csv'))
+        pd.testing.assert_frame_equal(AnalysisCorpus.load(str(written)).frame, frame)
+
+    print("✅ Corpus columns, aggregation and CSV round-trip verified")
+
 if __name__ == "__main__":
-    test_document_analyzer() 
\ No newline at end of file
+    test_document_analyzer()
+    test_bulk_scoring()
+    test_field_provenance()
+    test_form_fields()
+    test_analysis_corpus() 
\ No newline at end of file